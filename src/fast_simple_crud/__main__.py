@@ -2,18 +2,41 @@
 
 from __future__ import annotations
 
+import os
+import sys
+from typing import Any
+
 import uvicorn
 
 
-def main() -> None:
-    """Run the FastAPI application."""
+def _run(**options: Any) -> None:  # noqa: ANN401
+    """Run the FastAPI application with the shared server settings."""
     uvicorn.run(
         "fast_simple_crud.app:app",
-        host="0.0.0.0",  # nosec B104  # noqa: S104  # Development server binding
+        host="0.0.0.0",  # nosec B104  # noqa: S104  # Server binding
         port=8000,
-        reload=True,
+        # uvloop has no Windows build; fall back to the stdlib loop there.
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        **options,
     )
 
 
+def main_dev() -> None:
+    """Run a single auto-reloading development server."""
+    _run(reload=True)
+
+
+def main_prod() -> None:
+    """Run the production server with ``WEB_CONCURRENCY`` worker processes.
+
+    Items live in per-process memory, so each worker has its own ``db``.
+    Keep the default of one worker unless state has been moved to a shared
+    store.
+    """
+    _run(workers=int(os.environ.get("WEB_CONCURRENCY", "1")))
+
+
 if __name__ == "__main__":
-    main()
+    main_dev()
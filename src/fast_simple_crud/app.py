@@ -3,34 +3,219 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
+import hashlib
+import itertools
+import os
+import re
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager, suppress
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
-
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple
+
+import msgspec
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 
 from fast_simple_crud.models import Item, ItemCreate, ItemUpdate, Message
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, AsyncIterator
+    from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine
+
+_json_encoder = msgspec.json.Encoder()
+_message_decoder = msgspec.json.Decoder(Message)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered with msgspec instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:  # noqa: ANN401
+        """Serialize ``content`` to JSON bytes."""
+        return _json_encoder.encode(content)
+
+
+# msgspec reports the failing location as a "- at `$.field[0]`" suffix
+_ERROR_PATH = re.compile(r" - at `\$(.*)`$")
+_PATH_PART = re.compile(r"\.(\w+)|\[(\d+)\]")
+_MISSING_FIELD = re.compile(r"missing required field `(\w+)`")
+
+
+def _validation_error(exc: msgspec.DecodeError) -> RequestValidationError:
+    """Translate a msgspec decode error into FastAPI's 422 error format."""
+    msg = str(exc)
+    loc: list[str | int] = ["body"]
+    if (path := _ERROR_PATH.search(msg)) is not None:
+        msg = msg[: path.start()]
+        loc += [key or int(index) for key, index in _PATH_PART.findall(path[1])]
+    if (missing := _MISSING_FIELD.search(msg)) is not None:
+        loc.append(missing[1])
+        error_type = "missing"
+    elif isinstance(exc, msgspec.ValidationError):
+        error_type = "value_error"
+    else:
+        error_type = "json_invalid"
+    return RequestValidationError([{"type": error_type, "loc": tuple(loc), "msg": msg}])
+
+
+def _body[T](model: type[T]) -> Callable[[Request], Coroutine[Any, Any, T]]:
+    """Build a dependency that decodes the JSON request body into ``model``.
+
+    Lax mode keeps accepting the coercions pydantic allowed, such as numeric
+    strings for ``price`` or ``"true"`` for ``is_active``.
+    """
+    decoder = msgspec.json.Decoder(model, strict=False)
+
+    async def decode(request: Request) -> T:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as exc:
+            raise _validation_error(exc) from exc
+
+    return decode
+
+
+ItemCreateBody = Annotated[ItemCreate, Depends(_body(ItemCreate))]
+ItemUpdateBody = Annotated[ItemUpdate, Depends(_body(ItemUpdate))]
+
+# OpenAPI schemas for the msgspec models, which FastAPI cannot derive itself
+_, _schemas = msgspec.json.schema_components((Item, ItemCreate, ItemUpdate))
+
+
+def _openapi_json(schema: dict[str, Any]) -> dict[str, Any]:
+    """Describe a JSON request or response body for OpenAPI."""
+    return {"content": {"application/json": {"schema": schema}}}
+
+
+def _max_items(raw: str) -> int:
+    """Parse the store capacity, rejecting anything but a positive integer."""
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        msg = f"FAST_SIMPLE_CRUD_MAX_ITEMS must be a positive integer, got {raw!r}"
+        raise ValueError(msg)
+    return value
+
+
+# Upper bound on stored items; the least recently written item is evicted
+MAX_ITEMS = _max_items(os.environ.get("FAST_SIMPLE_CRUD_MAX_ITEMS", "10000"))
+
+# Responses at least this large are gzip-compressed for clients that accept it
+_GZIP_MINIMUM_SIZE = 1024
+_GZIP_COMPRESSLEVEL = 5
+
+
+class _Entry(NamedTuple):
+    """Stored item together with its serialized JSON body and ETag."""
+
+    item: Item
+    body: bytes
+    etag: str
+
+
+# In-memory storage, ordered from least to most recently written
+db: OrderedDict[int, _Entry] = OrderedDict()
+_id_gen = itertools.count(1)
+websocket_clients: set[WebSocket] = set()
+
+# Latest SSE tick, published once per second by ``_ticker`` to every stream
+_tick_event = asyncio.Event()
+_tick_payload: dict[str, str] = {}
+
+# Formatted server time, recomputed only when the wall-clock second changes
+_now_epoch: int = 0
+_now_iso: str = ""
+
+# Serialized GET /items body and its gzipped form, rebuilt lazily after any
+# write to ``db``
+_items_cache: bytes | None = None
+_items_cache_gzip: bytes | None = None
 
+# Bumped on every write; the process start time keeps list ETags from
+# repeating across restarts
+_db_version: int = 0
+_ETAG_PREFIX = f'W/"{time.time_ns():x}-'
 
-# In-memory storage
-db: dict[int, Item] = {}
-counter: int = 0
-websocket_clients: list[WebSocket] = []
+
+def _entry(item: Item) -> _Entry:
+    """Serialize an item and build its ``db`` entry."""
+    body = _json_encoder.encode(item)
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return _Entry(item, body, f'W/"{digest}"')
+
+
+def _insert(item: Item) -> _Entry:
+    """Store a new item, evicting the oldest entries beyond ``MAX_ITEMS``."""
+    entry = db[item.id] = _entry(item)
+    while len(db) > MAX_ITEMS:
+        db.popitem(last=False)
+    return entry
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if ``If-None-Match`` matches ``etag``.
+
+    Tags are compared weakly (ignoring any ``W/`` prefix), and ``*`` matches
+    any existing resource.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        tag = candidate.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+    return None
+
+
+def _json(body: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    """Wrap an already serialized JSON body in a response."""
+    return Response(body, status_code=status_code, media_type="application/json")
+
+
+def _invalidate_items_cache() -> None:
+    """Drop the serialized item list after ``db`` has been mutated."""
+    global _items_cache, _items_cache_gzip, _db_version  # noqa: PLW0603
+    _db_version += 1
+    _items_cache = None
+    _items_cache_gzip = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: ARG001
     """Application lifespan: startup and shutdown."""
-    global counter  # noqa: PLW0603
-    for i in range(1, 4):
-        db[i] = Item(id=i, name=f"Item {i}", price=i * 10.0)
-        counter = i
+    global _tick_event  # noqa: PLW0603
+    for _ in range(3):
+        item_id = next(_id_gen)
+        item = Item(id=item_id, name=f"Item {item_id}", price=item_id * 10.0)
+        _insert(item)
+    _invalidate_items_cache()
+    # Events bind to the loop that first waits on them, so start fresh
+    _tick_event = asyncio.Event()
+    ticker = asyncio.create_task(_ticker())
     yield
+    ticker.cancel()
+    with suppress(asyncio.CancelledError):
+        await ticker
     db.clear()
+    _invalidate_items_cache()
 
 
 app = FastAPI(
@@ -38,6 +223,12 @@ app = FastAPI(
     description="Demo: REST API, SSE, WebSocket",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=MsgspecJSONResponse,
+)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=_GZIP_MINIMUM_SIZE,
+    compresslevel=_GZIP_COMPRESSLEVEL,
 )
 
 
@@ -46,68 +237,142 @@ app = FastAPI(
 # =============================================================================
 
 
-@app.get("/items", response_model=list[Item], tags=["REST"])
-async def list_items() -> list[Item]:
+@app.get(
+    "/items",
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: _openapi_json({"type": "array", "items": _schemas["Item"]})
+    },
+    tags=["REST"],
+)
+async def list_items(request: Request) -> Response:
     """Get all items."""
-    return list(db.values())
+    global _items_cache, _items_cache_gzip  # noqa: PLW0603
+    etag = f'{_ETAG_PREFIX}{_db_version}"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    if _items_cache is None:
+        # ``db`` is ordered for eviction; clients get items in creation order
+        bodies = (entry.body for _, entry in sorted(db.items()))
+        _items_cache = b"[" + b",".join(bodies) + b"]"
+    accepts_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    if not accepts_gzip or len(_items_cache) < _GZIP_MINIMUM_SIZE:
+        response = _json(_items_cache)
+    else:
+        # Compress once per change; GZipMiddleware passes encoded bodies through
+        if _items_cache_gzip is None:
+            _items_cache_gzip = gzip.compress(
+                _items_cache, compresslevel=_GZIP_COMPRESSLEVEL, mtime=0
+            )
+        response = _json(_items_cache_gzip)
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+    response.headers["ETag"] = etag
+    return response
 
 
-@app.get("/items/{item_id}", response_model=Item, tags=["REST"])
-async def get_item(item_id: int) -> Item:
+@app.get(
+    "/items/{item_id}",
+    response_class=Response,
+    responses={status.HTTP_200_OK: _openapi_json(_schemas["Item"])},
+    tags=["REST"],
+)
+async def get_item(item_id: int, request: Request) -> Response:
     """Get item by ID."""
-    if item_id not in db:
+    entry = db.get(item_id)
+    if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    return db[item_id]
+    if (not_modified := _not_modified(request, entry.etag)) is not None:
+        return not_modified
+    response = _json(entry.body)
+    response.headers["ETag"] = entry.etag
+    return response
 
 
 @app.post(
     "/items",
-    response_model=Item,
+    response_class=Response,
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: _openapi_json(_schemas["Item"])},
+    openapi_extra={
+        "requestBody": {"required": True, **_openapi_json(_schemas["ItemCreate"])}
+    },
     tags=["REST"],
 )
-async def create_item(item: ItemCreate) -> Item:
+async def create_item(item: ItemCreateBody) -> Response:
     """Create new item."""
-    global counter  # noqa: PLW0603
-    counter += 1
-    new_item = Item(id=counter, **item.model_dump())
-    db[counter] = new_item
+    new_id = next(_id_gen)
+    new_item = Item(
+        id=new_id, name=item.name, price=item.price, is_active=item.is_active
+    )
+    entry = _insert(new_item)
+    _invalidate_items_cache()
     await broadcast(f"Item created: {new_item.name}")
-    return new_item
+    return _json(entry.body, status.HTTP_201_CREATED)
 
 
-@app.put("/items/{item_id}", response_model=Item, tags=["REST"])
-async def update_item(item_id: int, item: ItemCreate) -> Item:
+@app.put(
+    "/items/{item_id}",
+    response_class=Response,
+    responses={status.HTTP_200_OK: _openapi_json(_schemas["Item"])},
+    openapi_extra={
+        "requestBody": {"required": True, **_openapi_json(_schemas["ItemCreate"])}
+    },
+    tags=["REST"],
+)
+async def update_item(item_id: int, item: ItemCreateBody) -> Response:
     """Full update of item."""
     if item_id not in db:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    updated = Item(id=item_id, **item.model_dump())
-    db[item_id] = updated
+    updated = Item(
+        id=item_id, name=item.name, price=item.price, is_active=item.is_active
+    )
+    entry = _entry(updated)
+    db[item_id] = entry
+    db.move_to_end(item_id)
+    _invalidate_items_cache()
     await broadcast(f"Item updated: {updated.name}")
-    return updated
+    return _json(entry.body)
 
 
-@app.patch("/items/{item_id}", response_model=Item, tags=["REST"])
-async def patch_item(item_id: int, item: ItemUpdate) -> Item:
+@app.patch(
+    "/items/{item_id}",
+    response_class=Response,
+    responses={status.HTTP_200_OK: _openapi_json(_schemas["Item"])},
+    openapi_extra={
+        "requestBody": {"required": True, **_openapi_json(_schemas["ItemUpdate"])}
+    },
+    tags=["REST"],
+)
+async def patch_item(item_id: int, item: ItemUpdateBody) -> Response:
     """Partial update of item."""
-    if item_id not in db:
+    entry = db.get(item_id)
+    if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    current = db[item_id]
-    update_data = item.model_dump(exclude_unset=True)
-    updated = current.model_copy(update=update_data)
-    db[item_id] = updated
+    changes = {
+        field: value
+        for field in item.__struct_fields__
+        if (value := getattr(item, field)) is not None
+    }
+    if not changes:
+        return _json(entry.body)
+    updated = msgspec.structs.replace(entry.item, **changes)
+    entry = _entry(updated)
+    db[item_id] = entry
+    db.move_to_end(item_id)
+    _invalidate_items_cache()
     await broadcast(f"Item patched: {updated.name}")
-    return updated
+    return _json(entry.body)
 
 
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["REST"])
 async def delete_item(item_id: int) -> None:
     """Delete item."""
-    if item_id not in db:
+    entry = db.pop(item_id, None)
+    if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    name = db[item_id].name
-    del db[item_id]
-    await broadcast(f"Item deleted: {name}")
+    _invalidate_items_cache()
+    await broadcast(f"Item deleted: {entry.item.name}")
 
 
 # =============================================================================
@@ -115,12 +380,47 @@ async def delete_item(item_id: int) -> None:
 # =============================================================================
 
 
+def _server_time() -> str:
+    """Return the current UTC time as an ISO 8601 string, to the second."""
+    global _now_epoch, _now_iso  # noqa: PLW0603
+    sec = int(time.time())
+    if sec != _now_epoch:
+        _now_epoch = sec
+        _now_iso = datetime.fromtimestamp(sec, tz=UTC).isoformat()
+    return _now_iso
+
+
+def _publish_tick() -> None:
+    """Publish a new tick payload and wake every waiting SSE stream."""
+    global _tick_payload  # noqa: PLW0603
+    _tick_payload = {"event": "tick", "data": "Server time: " + _server_time()}
+    _tick_event.set()
+    _tick_event.clear()
+
+
+async def _ticker() -> None:
+    """Publish one tick per second, shared by all SSE streams.
+
+    Each sleep ends at the next wall-clock second, so timer drift cannot make
+    consecutive ticks repeat or skip a second.
+    """
+    while True:
+        _publish_tick()
+        await asyncio.sleep(1 - time.time() % 1)
+
+
 async def event_generator() -> AsyncGenerator[dict[str, str]]:
-    """Generate SSE events every second."""
+    """Generate SSE events for each tick published by the shared ticker.
+
+    New subscribers get the latest tick immediately rather than waiting for
+    the next one; it is built on demand if the ticker has not run yet.
+    """
+    if not _tick_payload:
+        _publish_tick()
+    yield _tick_payload
     while True:
-        now = datetime.now(tz=UTC).isoformat()
-        yield {"event": "tick", "data": f"Server time: {now}"}
-        await asyncio.sleep(1)
+        await _tick_event.wait()
+        yield _tick_payload
 
 
 @app.get("/sse/stream", tags=["SSE"])
@@ -135,27 +435,34 @@ async def sse_stream() -> EventSourceResponse:
 
 
 async def broadcast(message: str) -> None:
-    """Broadcast message to all connected WebSocket clients."""
-    for client in websocket_clients:
-        with suppress(Exception):
-            await client.send_json({"event": "broadcast", "data": message})
+    """Broadcast message to all connected WebSocket clients.
+
+    The payload is encoded once and sent to every client concurrently;
+    clients whose send fails are dropped from ``websocket_clients``.
+    """
+    if not websocket_clients:
+        return
+    clients = tuple(websocket_clients)
+    payload = _json_encoder.encode({"event": "broadcast", "data": message}).decode()
+    results = await asyncio.gather(
+        *(client.send_text(payload) for client in clients),
+        return_exceptions=True,
+    )
+    for client, result in zip(clients, results, strict=True):
+        if isinstance(result, Exception):
+            websocket_clients.discard(client)
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """WebSocket endpoint for real-time communication."""
     await websocket.accept()
-    websocket_clients.append(websocket)
+    websocket_clients.add(websocket)
     try:
         while True:
-            data = await websocket.receive_json()
-            msg = Message(**data)
+            msg = _message_decoder.decode(await websocket.receive_text())
             # Echo back with server acknowledgment
-            await websocket.send_json(
-                {
-                    "event": "echo",
-                    "data": f"Received: {msg.data}",
-                }
-            )
+            echo = {"event": "echo", "data": f"Received: {msg.data}"}
+            await websocket.send_text(_json_encoder.encode(echo).decode())
     except WebSocketDisconnect:
-        websocket_clients.remove(websocket)
+        websocket_clients.discard(websocket)
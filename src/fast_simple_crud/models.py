@@ -1,36 +1,40 @@
-"""Pydantic models for the API."""
+"""msgspec models for the API."""
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Annotated
 
+import msgspec
 
-class Item(BaseModel):
+PositiveFloat = Annotated[float, msgspec.Meta(gt=0)]
+
+
+class Item(msgspec.Struct, frozen=True, gc=False):
     """Item model."""
 
     id: int
     name: str
-    price: float = Field(gt=0)
+    price: PositiveFloat
     is_active: bool = True
 
 
-class ItemCreate(BaseModel):
+class ItemCreate(msgspec.Struct, frozen=True, gc=False):
     """Item creation model."""
 
     name: str
-    price: float = Field(gt=0)
+    price: PositiveFloat
     is_active: bool = True
 
 
-class ItemUpdate(BaseModel):
+class ItemUpdate(msgspec.Struct, frozen=True, gc=False):
     """Item update model (partial)."""
 
     name: str | None = None
-    price: float | None = Field(default=None, gt=0)
+    price: PositiveFloat | None = None
     is_active: bool | None = None
 
 
-class Message(BaseModel):
+class Message(msgspec.Struct, frozen=True, gc=False):
     """WebSocket message model."""
 
     event: str
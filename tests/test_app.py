@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
@@ -110,6 +112,211 @@ class TestItemsCRUD:
         response = await client.delete("/items/9999")
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_create_item_invalid_body(self, client: AsyncClient) -> None:
+        """Test invalid or malformed bodies are rejected with a 422 per field."""
+        response = await client.post("/items", json={"name": "Bad", "price": 0})
+        assert response.status_code == 422
+        assert response.json()["detail"] == [
+            {
+                "type": "value_error",
+                "loc": ["body", "price"],
+                "msg": "Expected `float` > 0.0",
+            }
+        ]
+        response = await client.post("/items", json={"price": 1.0})
+        assert response.json()["detail"][0]["type"] == "missing"
+        assert response.json()["detail"][0]["loc"] == ["body", "name"]
+        response = await client.post("/items", content=b"{not json")
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+        assert response.json()["detail"][0]["loc"] == ["body"]
+
+    @pytest.mark.asyncio
+    async def test_create_item_coerces_strings(self, client: AsyncClient) -> None:
+        """Test lax parsing accepts numeric and boolean strings."""
+        response = await client.post(
+            "/items", json={"name": "Lax", "price": "10", "is_active": "false"}
+        )
+        assert response.status_code == 201
+        assert response.json()["price"] == 10.0
+        assert response.json()["is_active"] is False
+
+    @pytest.mark.asyncio
+    async def test_patch_item_ignores_nulls(self, client: AsyncClient) -> None:
+        """Test explicit nulls and empty bodies leave the item unchanged."""
+        create_resp = await client.post("/items", json={"name": "Keep", "price": 3.0})
+        item = create_resp.json()
+        response = await client.patch(f"/items/{item['id']}", json={"name": None})
+        assert response.status_code == 200
+        assert response.json() == item
+        response = await client.patch(f"/items/{item['id']}", json={})
+        assert response.json() == item
+
+    @pytest.mark.asyncio
+    async def test_get_item_reflects_writes(self, client: AsyncClient) -> None:
+        """Test the stored JSON body is refreshed after an update."""
+        create_resp = await client.post("/items", json={"name": "Old", "price": 2.0})
+        item_id = create_resp.json()["id"]
+        await client.patch(f"/items/{item_id}", json={"name": "New"})
+        response = await client.get(f"/items/{item_id}")
+        assert response.json() == {
+            "id": item_id,
+            "name": "New",
+            "price": 2.0,
+            "is_active": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_create_item_evicts_oldest(self, client: AsyncClient) -> None:
+        """Test the least recently written item is evicted past MAX_ITEMS."""
+        from fast_simple_crud.app import db
+
+        await client.post("/items", json={"name": "Filler", "price": 1.0})
+        oldest = next(iter(db))
+        with patch("fast_simple_crud.app.MAX_ITEMS", len(db)):
+            response = await client.post(
+                "/items", json={"name": "Newest", "price": 1.0}
+            )
+        assert response.status_code == 201
+        assert oldest not in db
+        assert response.json()["id"] in db
+
+    @pytest.mark.asyncio
+    async def test_list_items_keeps_creation_order(self, client: AsyncClient) -> None:
+        """Test updates do not reorder GET /items."""
+        ids = []
+        for i in range(3):
+            response = await client.post("/items", json={"name": f"O{i}", "price": 1.0})
+            ids.append(response.json()["id"])
+        await client.put(f"/items/{ids[0]}", json={"name": "Put", "price": 2.0})
+        await client.patch(f"/items/{ids[1]}", json={"name": "Patched"})
+        listed = [item["id"] for item in (await client.get("/items")).json()]
+        assert [item_id for item_id in listed if item_id in ids] == ids
+        assert listed == sorted(listed)
+
+    @pytest.mark.asyncio
+    async def test_cap_below_current_size(self) -> None:
+        """Test a cap below the store size is enforced on seeding and create."""
+        from httpx import ASGITransport, AsyncClient
+
+        from fast_simple_crud.app import app, db, lifespan
+
+        saved = dict(db)
+        db.clear()
+        try:
+            with patch("fast_simple_crud.app.MAX_ITEMS", 1):
+                async with lifespan(app):
+                    assert len(db) == 1
+                    seeded = next(iter(db))
+                    db.update(saved)
+                    async with AsyncClient(
+                        transport=ASGITransport(app=app), base_url="http://test"
+                    ) as client:
+                        response = await client.post(
+                            "/items", json={"name": "Only", "price": 1.0}
+                        )
+                    assert list(db) == [response.json()["id"]]
+                    assert seeded not in db
+        finally:
+            db.clear()
+            db.update(saved)
+
+    @pytest.mark.parametrize("raw", ["0", "-5", "lots"])
+    def test_max_items_rejects_invalid(self, raw: str) -> None:
+        """Test non-positive or non-integer capacities are rejected."""
+        from fast_simple_crud.app import _max_items
+
+        with pytest.raises(ValueError, match="FAST_SIMPLE_CRUD_MAX_ITEMS"):
+            _max_items(raw)
+        assert _max_items("1") == 1
+
+    @pytest.mark.asyncio
+    async def test_list_items_reflects_writes(self, client: AsyncClient) -> None:
+        """Test cached item list is refreshed after a write."""
+        await client.get("/items")
+        create_resp = await client.post("/items", json={"name": "Listed", "price": 5.0})
+        item_id = create_resp.json()["id"]
+        response = await client.get("/items")
+        assert item_id in {item["id"] for item in response.json()}
+        await client.delete(f"/items/{item_id}")
+        response = await client.get("/items")
+        assert item_id not in {item["id"] for item in response.json()}
+
+    @pytest.mark.asyncio
+    async def test_list_items_gzip(self, client: AsyncClient) -> None:
+        """Test large item lists are served gzipped when accepted."""
+        for i in range(30):
+            await client.post("/items", json={"name": f"Bulk {i}", "price": 1.0})
+        response = await client.get("/items", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        items = response.json()
+        response = await client.get("/items", headers={"Accept-Encoding": "gzip"})
+        assert response.json() == items
+        response = await client.get("/items", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == items
+
+    @pytest.mark.asyncio
+    async def test_list_items_etag(self, client: AsyncClient) -> None:
+        """Test GET /items answers 304 until the collection changes."""
+        etag = (await client.get("/items")).headers["etag"]
+        response = await client.get("/items", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        await client.post("/items", json={"name": "Fresh", "price": 1.0})
+        response = await client.get("/items", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_lists_and_wildcard(self, client: AsyncClient) -> None:
+        """Test multi-value, weak-stripped and wildcard If-None-Match headers."""
+        create_resp = await client.post("/items", json={"name": "Inm", "price": 1.0})
+        url = f"/items/{create_resp.json()['id']}"
+        etag = (await client.get(url)).headers["etag"]
+        opaque = etag.removeprefix("W/")
+        for header in (f'"other", {etag}', f'W/"other",{opaque}', "*"):
+            response = await client.get(url, headers={"If-None-Match": header})
+            assert response.status_code == 304, header
+        response = await client.get(url, headers={"If-None-Match": '"other", W/"x"'})
+        assert response.status_code == 200
+        response = await client.get("/items/9999", headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_get_item_etag(self, client: AsyncClient) -> None:
+        """Test GET /items/{id} answers 304 until the item changes."""
+        create_resp = await client.post("/items", json={"name": "Tag", "price": 1.0})
+        item_id = create_resp.json()["id"]
+        etag = (await client.get(f"/items/{item_id}")).headers["etag"]
+        await client.post("/items", json={"name": "Other", "price": 1.0})
+        response = await client.get(
+            f"/items/{item_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        await client.patch(f"/items/{item_id}", json={"price": 2.0})
+        response = await client.get(
+            f"/items/{item_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["price"] == 2.0
+
+
+class TestModels:
+    """Tests for API models."""
+
+    def test_item_is_frozen(self) -> None:
+        """Test stored items cannot be mutated in place."""
+        import msgspec
+
+        from fast_simple_crud.models import Item
+
+        item = Item(id=1, name="Frozen", price=1.0)
+        with pytest.raises(AttributeError):
+            item.name = "Changed"  # type: ignore[misc]
+        assert msgspec.structs.replace(item, name="Copy").name == "Copy"
+
 
 class TestSSE:
     """Tests for SSE endpoint."""
@@ -117,27 +324,96 @@ class TestSSE:
     @pytest.mark.asyncio
     async def test_event_generator(self) -> None:
         """Test event generator yields correct format."""
-        from fast_simple_crud.app import event_generator
+        from fast_simple_crud.app import _publish_tick, event_generator
 
-        gen = event_generator()
-        event = await gen.__anext__()
-        assert event["event"] == "tick"
-        assert "Server time:" in event["data"]
-        await gen.aclose()
+        with patch("fast_simple_crud.app._tick_event", asyncio.Event()):
+            gen = event_generator()
+            await gen.__anext__()
+            pending = asyncio.ensure_future(gen.__anext__())
+            await asyncio.sleep(0)
+            assert not pending.done()
+            _publish_tick()
+            event = await pending
+            assert event["event"] == "tick"
+            assert "Server time:" in event["data"]
+            await gen.aclose()
 
     @pytest.mark.asyncio
-    async def test_event_generator_multiple_events(self) -> None:
-        """Test event generator yields multiple events."""
-        with patch("fast_simple_crud.app.asyncio.sleep", return_value=None):
-            from fast_simple_crud.app import event_generator
+    async def test_event_generator_first_event_immediate(self) -> None:
+        """Test a new stream gets a tick without waiting for the ticker."""
+        from fast_simple_crud.app import event_generator
 
+        with (
+            patch("fast_simple_crud.app._tick_event", asyncio.Event()),
+            patch("fast_simple_crud.app._tick_payload", {}),
+        ):
             gen = event_generator()
-            event1 = await gen.__anext__()
-            event2 = await gen.__anext__()
-            assert event1["event"] == "tick"
-            assert event2["event"] == "tick"
+            event = await asyncio.wait_for(gen.__anext__(), timeout=0.1)
+            assert event["event"] == "tick"
+            assert "Server time:" in event["data"]
             await gen.aclose()
 
+    @pytest.mark.asyncio
+    async def test_event_generator_shares_ticks(self) -> None:
+        """Test every stream receives the same payload for a tick."""
+        from fast_simple_crud.app import _publish_tick, event_generator
+
+        with patch("fast_simple_crud.app._tick_event", asyncio.Event()):
+            gens = [event_generator(), event_generator()]
+            for gen in gens:
+                await gen.__anext__()
+            pending = [asyncio.ensure_future(gen.__anext__()) for gen in gens]
+            await asyncio.sleep(0)
+            _publish_tick()
+            event1, event2 = await asyncio.gather(*pending)
+            assert event1 is event2
+            assert event1["event"] == "tick"
+            for gen in gens:
+                await gen.aclose()
+
+    @pytest.mark.asyncio
+    async def test_ticker_ticks_every_second(self) -> None:
+        """Test back-to-back ticks carry consecutive, distinct timestamps."""
+        from datetime import datetime, timedelta
+
+        from fast_simple_crud.app import _server_time, _ticker
+
+        clock = 1_700_000_000.999
+        stamps: list[str] = []
+
+        async def late_sleep(delay: float) -> None:
+            nonlocal clock
+            clock += delay + 0.003  # every wakeup is slightly late
+            if len(stamps) == 5:
+                raise asyncio.CancelledError
+
+        with (
+            patch("fast_simple_crud.app.time.time", side_effect=lambda: clock),
+            patch("fast_simple_crud.app.asyncio.sleep", late_sleep),
+            patch(
+                "fast_simple_crud.app._publish_tick",
+                lambda: stamps.append(_server_time()),
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await _ticker()
+        times = [datetime.fromisoformat(stamp) for stamp in stamps]
+        assert all(
+            later - earlier == timedelta(seconds=1)
+            for earlier, later in itertools.pairwise(times)
+        )
+
+    def test_server_time_cached_per_second(self) -> None:
+        """Test the timestamp is only reformatted when the second changes."""
+        from fast_simple_crud.app import _server_time
+
+        with patch("fast_simple_crud.app.time.time", return_value=1_700_000_000.25):
+            first = _server_time()
+            assert _server_time() is first
+        assert first == "2023-11-14T22:13:20+00:00"
+        with patch("fast_simple_crud.app.time.time", return_value=1_700_000_001.0):
+            assert _server_time() == "2023-11-14T22:13:21+00:00"
+
     @pytest.mark.asyncio
     async def test_sse_stream_returns_event_source_response(self) -> None:
         """Test sse_stream returns EventSourceResponse."""
@@ -160,12 +436,14 @@ class TestBroadcast:
         from fast_simple_crud.app import broadcast, websocket_clients
 
         mock_client = AsyncMock()
-        websocket_clients.append(mock_client)
+        websocket_clients.add(mock_client)
         try:
             await broadcast("test message")
-            mock_client.send_json.assert_called_once()
+            mock_client.send_text.assert_called_once_with(
+                '{"event":"broadcast","data":"test message"}'
+            )
         finally:
-            websocket_clients.remove(mock_client)
+            websocket_clients.discard(mock_client)
 
     @pytest.mark.asyncio
     async def test_broadcast_handles_error(self) -> None:
@@ -175,13 +453,21 @@ class TestBroadcast:
         from fast_simple_crud.app import broadcast, websocket_clients
 
         mock_client = AsyncMock()
-        mock_client.send_json.side_effect = Exception("Connection lost")
-        websocket_clients.append(mock_client)
-        try:
-            # Should not raise
+        mock_client.send_text.side_effect = Exception("Connection lost")
+        websocket_clients.add(mock_client)
+        # Should not raise, and the failed client is dropped
+        await broadcast("test message")
+        assert mock_client not in websocket_clients
+
+    @pytest.mark.asyncio
+    async def test_broadcast_without_clients(self) -> None:
+        """Test broadcast skips encoding when nobody is connected."""
+        from fast_simple_crud.app import broadcast, websocket_clients
+
+        assert not websocket_clients
+        with patch("fast_simple_crud.app._json_encoder") as encoder:
             await broadcast("test message")
-        finally:
-            websocket_clients.remove(mock_client)
+        encoder.encode.assert_not_called()
 
     """Tests for WebSocket endpoint."""
 
@@ -202,13 +488,30 @@ class TestBroadcast:
 class TestMain:
     """Tests for __main__ module."""
 
-    def test_main_function(self) -> None:
-        """Test main entry point."""
+    def test_main_dev(self) -> None:
+        """Test development entry point."""
         with patch("uvicorn.run") as mock_run:
-            from fast_simple_crud.__main__ import main
+            from fast_simple_crud.__main__ import main_dev
 
-            main()
+            main_dev()
             mock_run.assert_called_once()
+            kwargs = mock_run.call_args.kwargs
+            assert kwargs["reload"] is True
+            assert kwargs["http"] == "httptools"
+            assert kwargs["loop"] in {"uvloop", "asyncio"}
+
+    def test_main_prod(self) -> None:
+        """Test production entry point reads the worker count."""
+        with (
+            patch("uvicorn.run") as mock_run,
+            patch.dict("os.environ", {"WEB_CONCURRENCY": "4"}),
+        ):
+            from fast_simple_crud.__main__ import main_prod
+
+            main_prod()
+            kwargs = mock_run.call_args.kwargs
+            assert kwargs["workers"] == 4
+            assert "reload" not in kwargs
 
     def test_main_block(self) -> None:
         """Test __main__ block execution."""